@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import time
 from typing import List, Dict, Optional
@@ -7,6 +8,17 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+def _build_session() -> requests.Session:
+    """Build the keep-alive session shared by all API calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount('https://', adapter)
+    return session
+
+# Shared across APIManager instances (one is built per request) so TLS
+# connections to each API host are reused between searches
+_SESSION = _build_session()
+
 class APIManager:
     def __init__(self, jooble_key: str = None, adzuna_app_id: str = None, 
                  adzuna_app_key: str = None, jsearch_key: str = None):
@@ -14,6 +26,7 @@ class APIManager:
         self.adzuna_app_id = adzuna_app_id
         self.adzuna_app_key = adzuna_app_key
         self.jsearch_key = jsearch_key
+        self.session = _SESSION
         
         # Rate limiting
         self.last_request_times = {}
@@ -53,7 +66,7 @@ class APIManager:
                 "page": 1
             }
             
-            response = requests.post(jooble_url, json=jooble_params, timeout=12)
+            response = self.session.post(jooble_url, json=jooble_params, timeout=12)
             
             if response.status_code == 200:
                 data = response.json()
@@ -175,7 +188,7 @@ class APIManager:
             if location_query:
                 params['where'] = location_query
             
-            response = requests.get(base_url, params=params, timeout=12)
+            response = self.session.get(base_url, params=params, timeout=12)
             
             if response.status_code == 200:
                 data = response.json()
@@ -325,7 +338,7 @@ class APIManager:
                 "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = self.session.get(url, headers=headers, params=params, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
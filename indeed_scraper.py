@@ -1,16 +1,179 @@
 import asyncio
+import atexit
+import concurrent.futures
 import random
+import re
 import logging
 from typing import List, Dict, Optional
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from playwright_stealth import stealth_async
 from proxy_manager import ProxyManager
 from user_agent_manager import UserAgentManager
+from ttl_cache import TTLCache
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Chromium flags tuned for a small per-instance memory footprint
+CHROMIUM_ARGS = [
+    '--headless=new',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-software-rasterizer',
+    '--disable-extensions',
+    '--disable-blink-features=AutomationControlled'
+]
+
+# Warm browser contexts kept ready for incoming searches
+CONTEXT_POOL_SIZE = 4
+CONTEXT_MAX_USES = 20     # Recycle a context after this many searches
+CONTEXT_WAIT_TIMEOUT = 20 # Seconds to wait for a free context
+CARDS_WAIT_TIMEOUT = 3000 # Milliseconds to wait for job cards to render
+SEARCH_TIMEOUT = 25       # Seconds before a search is cancelled on the loop
+
+# Location keywords that select a country-specific Indeed domain
+COUNTRY_PATTERN = re.compile(r'\b(uk|united kingdom|nigeria|lagos|abuja|calabar)\b', re.IGNORECASE)
+COUNTRY_FOR_KEYWORD = {
+    'uk': 'gb',
+    'united kingdom': 'gb',
+    'nigeria': 'ng',
+    'lagos': 'ng',
+    'abuja': 'ng',
+    'calabar': 'ng'
+}
+
+# Form job types mapped to Indeed's jt parameter
+JOB_TYPE_MAP = {
+    'fulltime': 'fulltime',
+    'parttime': 'parttime',
+    'contract': 'contract',
+    'freelance': 'contract'
+}
+
+# Whole titles of anti-bot interstitials served instead of results; matched
+# against the full title because results titles echo the search keywords
+BLOCK_PAGE_PATTERN = re.compile(
+    r'just a moment\.*|attention required! \| cloudflare|hcaptcha|'
+    r'security check(?: - indeed\.com)?|blocked|are you a (?:human|robot)\??',
+    re.IGNORECASE
+)
+
+# Currency markers that make a salary snippet worth keeping
+CURRENCY_PATTERN = re.compile(r'[₦$€£]|\b(?:USD|NGN|GBP|EUR)\b')
+
+# Placeholder or broken titles that indicate a bad card
+SPAM_TITLE_PATTERN = re.compile(r'undefined|null|error|test job', re.IGNORECASE)
+
+# Headers sent with every page request from a pooled context
+EXTRA_HTTP_HEADERS = {
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+}
+
+# Subresources never needed to read job cards
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# Selectors for job cards and their fields, in priority order
+JOB_CARD_SELECTORS = (
+    '[data-jk]',
+    '.jobsearch-SerpJobCard',
+    '.job_seen_beacon',
+    'td.resultContent'
+)
+TITLE_SELECTORS = (
+    'h2 a span[title]',
+    'h2 a',
+    '.jobTitle a',
+    '[data-testid="job-title"] a'
+)
+COMPANY_SELECTORS = (
+    '[data-testid="company-name"]',
+    '.companyName',
+    'span.companyName'
+)
+LOCATION_SELECTORS = (
+    '[data-testid="job-location"]',
+    '.companyLocation'
+)
+SALARY_SELECTOR = '.salary-snippet, [data-testid*="salary"]'
+LINK_SELECTOR = 'h2 a[href]'
+DESCRIPTION_SELECTOR = '.job-snippet, .summary'
+
+# Compound selectors for any job card and for each card field
+JOB_CARDS_SELECTOR = ', '.join(JOB_CARD_SELECTORS)
+TITLE_SELECTOR = ', '.join(TITLE_SELECTORS)
+COMPANY_SELECTOR = ', '.join(COMPANY_SELECTORS)
+LOCATION_SELECTOR = ', '.join(LOCATION_SELECTORS)
+
+# Runs in the page: picks the first matching card selector and reads the
+# raw fields of up to maxCards cards
+EXTRACT_CARDS_JS = """
+(opts) => {
+    const cardSelector = opts.cardSelectors.find(s => document.querySelector(s));
+    if (!cardSelector) return [];
+
+    const text = el => (el.innerText || '').trim();
+    // [field, selector, reader, skip empty matches]
+    const fields = [
+        ['title', opts.title, el => (el.getAttribute('title') || el.innerText || '').trim(), true],
+        ['company', opts.company, text, true],
+        ['location', opts.location, text, true],
+        ['salary', opts.salary, text, false],
+        ['href', opts.link, el => el.getAttribute('href'), false],
+        ['description', opts.description, text, false]
+    ];
+    const anyField = fields.map(f => f[1]).join(', ');
+
+    // One subtree walk per card; nodes are routed to fields in document order
+    const readCard = card => {
+        const job = {title: '', company: '', location: '', salary: '', href: null, description: ''};
+        const found = new Set();
+        for (const el of card.querySelectorAll(anyField)) {
+            for (const [name, selector, read, skipEmpty] of fields) {
+                if (found.has(name) || !el.matches(selector)) continue;
+                const value = read(el);
+                if (skipEmpty && !value) continue;
+                job[name] = value;
+                found.add(name);
+            }
+            if (found.size === fields.length) break;
+        }
+        job.jk = card.getAttribute('data-jk');
+        return job;
+    };
+
+    // Stop at maxCards unique postings; Indeed repeats data-jk on nested nodes
+    const cards = [];
+    const seen = new Set();
+    for (const card of document.querySelectorAll(cardSelector)) {
+        const jk = card.getAttribute('data-jk');
+        if (jk) {
+            if (seen.has(jk)) continue;
+            seen.add(jk);
+        }
+        cards.push(card);
+        if (cards.length >= opts.maxCards) break;
+    }
+
+    return cards.map(readCard);
+}
+"""
+
 class IndeedScraper:
+    # Browser state is shared by all instances so the pool stays warm
+    # across requests (the app builds a new aggregator per request)
+    _loop = None
+    _playwright = None
+    _browser = None
+    _browser_lock = None
+    _ctx_pool = None
+    _ctx_missing = 0          # Pool slots whose replacement context failed to open
+    _init_lock = threading.Lock()
+    
+    # Parsed results per (search URL, max results), shared across instances
+    _results_cache = TTLCache(maxsize=512, ttl=3600)
+
     def __init__(self, proxy_manager: ProxyManager, user_agent_manager: UserAgentManager):
         self.proxy_manager = proxy_manager
         self.ua_manager = user_agent_manager
@@ -19,33 +182,43 @@ class IndeedScraper:
             'gb': 'https://uk.indeed.com',
             'global': 'https://indeed.com'
         }
-        self._lock = threading.Lock()
     
     def search_jobs(self, keywords: str, location: str = '', job_type: str = '', 
                    max_results: int = 10, country: str = 'global') -> List[Dict]:
-        """Search jobs using Playwright with thread-safe execution"""
+        """Search jobs using Playwright on the shared browser event loop"""
         try:
             # Determine best Indeed domain
-            if 'uk' in location.lower() or 'united kingdom' in location.lower():
-                country = 'gb'
-            elif any(nigerian_city in location.lower() for nigerian_city in ['nigeria', 'lagos', 'abuja', 'calabar']):
-                country = 'ng'
+            match = COUNTRY_PATTERN.search(location)
+            if match:
+                country = COUNTRY_FOR_KEYWORD[match.group(1).lower()]
             
             base_url = self.base_urls.get(country, self.base_urls['global'])
             search_url = self._build_search_url(base_url, keywords, location, job_type)
             
+            cache_key = (search_url, max_results)
+            cached_jobs = self._results_cache.get(cache_key)
+            if cached_jobs is not None:
+                logger.info(f"Indeed cache hit: {search_url}")
+                return [job.copy() for job in cached_jobs]
+            
             logger.info(f"Indeed scraper starting: {search_url}")
             
-            # Run async search in a new event loop (thread-safe)
-            with self._lock:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    jobs = loop.run_until_complete(
-                        self._async_search_jobs(search_url, base_url, max_results)
-                    )
-                finally:
-                    loop.close()
+            # Run async search on the shared loop (thread-safe)
+            future = asyncio.run_coroutine_threadsafe(
+                self._async_search_jobs(search_url, base_url, max_results),
+                self._get_loop()
+            )
+            try:
+                jobs = future.result(timeout=SEARCH_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                # Cancel the coroutine so its page is closed and the context is released
+                future.cancel()
+                logger.warning(f"Indeed search timed out after {SEARCH_TIMEOUT}s")
+                return []
+            
+            # Only cache successful scrapes so blocked pages are retried
+            if jobs:
+                self._results_cache.set(cache_key, [job.copy() for job in jobs])
             
             logger.info(f"Indeed scraper found {len(jobs)} jobs")
             return jobs
@@ -54,6 +227,123 @@ class IndeedScraper:
             logger.error(f"Error in Indeed scraper: {str(e)}")
             return []
     
+    @classmethod
+    def _get_loop(cls) -> asyncio.AbstractEventLoop:
+        """Get the shared browser event loop, starting it on first use"""
+        with cls._init_lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='indeed-browser', daemon=True)
+                thread.start()
+                cls._browser_lock = asyncio.Lock()
+                cls._loop = loop
+                atexit.register(cls.shutdown)
+        return cls._loop
+    
+    @classmethod
+    def shutdown(cls):
+        """Close pooled contexts and the shared browser"""
+        if cls._loop is None or not cls._loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(cls._close_browser(), cls._loop).result(timeout=10)
+        except Exception as e:
+            logger.debug(f"Error shutting down Indeed browser: {str(e)}")
+    
+    @classmethod
+    async def _close_browser(cls):
+        """Close the shared browser and Playwright driver"""
+        if cls._browser:
+            await cls._browser.close()
+            cls._browser = None
+        if cls._playwright:
+            await cls._playwright.stop()
+            cls._playwright = None
+        cls._ctx_pool = None
+    
+    async def _ensure_browser(self):
+        """Launch the shared browser and fill the context pool if needed"""
+        cls = IndeedScraper
+        async with cls._browser_lock:
+            if not (cls._browser and cls._browser.is_connected()):
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                
+                # Launch browser with low-memory configuration
+                cls._browser = await cls._playwright.chromium.launch(
+                    headless=True,
+                    args=CHROMIUM_ARGS
+                )
+                
+                # Publish the empty pool before filling it, so a fill that fails or
+                # is cancelled leaves its slots counted for the refill below
+                cls._ctx_pool = asyncio.Queue(maxsize=CONTEXT_POOL_SIZE)
+                cls._ctx_missing = CONTEXT_POOL_SIZE
+                logger.info(f"Indeed browser started, warming {CONTEXT_POOL_SIZE} contexts")
+            
+            # Fill empty slots: the whole pool after a launch, or ones lost while recycling
+            while cls._ctx_missing:
+                try:
+                    cls._ctx_pool.put_nowait((await self._new_context(), 0))
+                except Exception as e:
+                    logger.debug(f"Could not refill Indeed context pool: {str(e)}")
+                    break
+                cls._ctx_missing -= 1
+    
+    async def _new_context(self):
+        """Create a browser context with a fresh user agent"""
+        context = await IndeedScraper._browser.new_context(
+            user_agent=self.ua_manager.get_chrome_user_agent(),
+            viewport={'width': 1366, 'height': 768},
+            locale='en-US',
+            timezone_id='America/New_York',
+            extra_http_headers=EXTRA_HTTP_HEADERS
+        )
+        
+        # Skip heavy subresources so the page only waits on HTML and scripts
+        await context.route('**/*', self._route_request)
+        return context
+    
+    @staticmethod
+    async def _route_request(route):
+        """Abort requests for resources the parser never reads"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _release_context(self, pool: asyncio.Queue, context, page, uses: int, healthy: bool):
+        """Close the page and return its context to the pool, recycling it when worn or broken"""
+        if page:
+            try:
+                await page.close()
+            except Exception:
+                healthy = False
+        
+        if healthy and uses < CONTEXT_MAX_USES:
+            try:
+                await context.clear_cookies()
+                pool.put_nowait((context, uses))
+                return
+            except Exception as e:
+                logger.debug(f"Recycling Indeed context after failed cookie clear: {str(e)}")
+        
+        # Close the old context best-effort; the slot is refilled either way
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Error closing Indeed context: {str(e)}")
+        
+        # A relaunched browser has built a new pool, so this slot is gone with the old one
+        if pool is not IndeedScraper._ctx_pool:
+            return
+        
+        try:
+            pool.put_nowait((await self._new_context(), 0))
+        except Exception as e:
+            IndeedScraper._ctx_missing += 1
+            logger.debug(f"Could not replace Indeed context, refilling later: {str(e)}")
+    
     def _build_search_url(self, base_url: str, keywords: str, location: str, job_type: str) -> str:
         """Build Indeed search URL"""
         params = []
@@ -66,71 +356,57 @@ class IndeedScraper:
         params.append("sort=relevance")
         
         if job_type and job_type != 'all':
-            job_type_map = {
-                'fulltime': 'fulltime',
-                'parttime': 'parttime',
-                'contract': 'contract',
-                'freelance': 'contract'
-            }
-            if job_type.lower() in job_type_map:
-                params.append(f"jt={job_type_map[job_type.lower()]}")
+            indeed_job_type = JOB_TYPE_MAP.get(job_type.lower())
+            if indeed_job_type:
+                params.append(f"jt={indeed_job_type}")
         
         return f"{base_url}/jobs?{'&'.join(params)}"
     
     async def _async_search_jobs(self, search_url: str, base_url: str, max_results: int) -> List[Dict]:
-        """Async job search with Playwright"""
+        """Async job search with Playwright using a pooled context"""
         jobs = []
-        browser = None
         
         try:
-            async with async_playwright() as p:
-                # Launch browser with simple configuration
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-gpu',
-                        '--disable-blink-features=AutomationControlled'
-                    ]
-                )
-                
-                # Create context with specific user agent
-                context = await browser.new_context(
-                    user_agent=self.ua_manager.get_chrome_user_agent(),
-                    viewport={'width': 1366, 'height': 768},
-                    locale='en-US',
-                    timezone_id='America/New_York'
-                )
-                
-                page = await context.new_page()
-                
-                # Apply stealth
-                await stealth_async(page)
-                
-                # Set additional headers
-                await page.set_extra_http_headers({
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
-                })
-                
-                # Navigate to Indeed
-                await page.goto(search_url, wait_until='domcontentloaded', timeout=20000)
-                
-                # Wait for content to load
-                await page.wait_for_timeout(3000)
-                
-                # Parse jobs from page
-                jobs = await self._parse_jobs_from_page(page, base_url, max_results)
-                
-                await context.close()
-                
+            await self._ensure_browser()
+            pool = IndeedScraper._ctx_pool
+            context, uses = await asyncio.wait_for(pool.get(), timeout=CONTEXT_WAIT_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Playwright Indeed browser unavailable: {str(e)}")
+            return jobs
+        
+        page = None
+        healthy = True
+        try:
+            page = await context.new_page()
+            
+            # Apply stealth
+            await stealth_async(page)
+            
+            # Navigate to Indeed
+            await page.goto(search_url, wait_until='domcontentloaded', timeout=20000)
+            
+            # Bail out early on block pages and retire the flagged context
+            page_title = await page.title()
+            if BLOCK_PAGE_PATTERN.fullmatch(page_title.strip()):
+                logger.warning(f"Indeed served a block page: {page_title}")
+                healthy = False
+                return jobs
+            
+            # Wait until job cards render rather than sleeping a fixed interval
+            try:
+                await page.wait_for_selector(JOB_CARDS_SELECTOR, state='attached', timeout=CARDS_WAIT_TIMEOUT)
+            except PlaywrightTimeoutError:
+                logger.debug("No Indeed job cards rendered before timeout")
+            
+            # Parse jobs from page
+            jobs = await self._parse_jobs_from_page(page, base_url, max_results)
+            
         except Exception as e:
+            healthy = False
             logger.warning(f"Playwright Indeed search failed: {str(e)}")
         finally:
-            if browser:
-                await browser.close()
+            # Shielded so a caller timeout cannot cancel the release and lose the slot
+            await asyncio.shield(self._release_context(pool, context, page, uses + 1, healthy))
         
         return jobs
     
@@ -139,33 +415,27 @@ class IndeedScraper:
         jobs = []
         
         try:
-            # Multiple selectors for job cards
-            job_selectors = [
-                '[data-jk]',
-                '.jobsearch-SerpJobCard',
-                '.job_seen_beacon',
-                'td.resultContent'
-            ]
+            # Read every card in a single browser round-trip
+            raw_cards = await page.evaluate(EXTRACT_CARDS_JS, {
+                'cardSelectors': list(JOB_CARD_SELECTORS),
+                'maxCards': max_results,
+                'title': TITLE_SELECTOR,
+                'company': COMPANY_SELECTOR,
+                'location': LOCATION_SELECTOR,
+                'salary': SALARY_SELECTOR,
+                'link': LINK_SELECTOR,
+                'description': DESCRIPTION_SELECTOR
+            })
             
-            job_cards = []
-            for selector in job_selectors:
-                try:
-                    cards = await page.locator(selector).all()
-                    if cards:
-                        job_cards = cards
-                        logger.debug(f"Found {len(cards)} job cards with selector: {selector}")
-                        break
-                except:
-                    continue
-            
-            if not job_cards:
+            if not raw_cards:
                 logger.warning("No job cards found on Indeed page")
                 return []
             
-            # Extract job data from cards
-            for i, card in enumerate(job_cards[:max_results]):
+            logger.debug(f"Found {len(raw_cards)} job cards on Indeed page")
+            
+            for i, raw_card in enumerate(raw_cards):
                 try:
-                    job_data = await self._extract_job_data_from_card(card, base_url)
+                    job_data = self._build_job_from_card(raw_card, base_url)
                     if job_data and self._is_valid_job(job_data):
                         jobs.append(job_data)
                 except Exception as e:
@@ -177,130 +447,40 @@ class IndeedScraper:
         
         return jobs
     
-    async def _extract_job_data_from_card(self, card, base_url: str) -> Optional[Dict]:
-        """Extract job data from a single job card"""
-        try:
-            job_data = {
-                'title': '',
-                'company': '',
-                'location': '',
-                'salary': '',
-                'link': '',
-                'description': '',
-                'job_type': '',
-                'source': 'Indeed'
-            }
-            
-            # Extract title
-            title_selectors = [
-                'h2 a span[title]',
-                'h2 a',
-                '.jobTitle a',
-                '[data-testid="job-title"] a'
-            ]
-            
-            for selector in title_selectors:
-                try:
-                    title_elem = card.locator(selector).first
-                    if await title_elem.count() > 0:
-                        title = await title_elem.get_attribute('title')
-                        if not title:
-                            title = await title_elem.inner_text()
-                        if title and title.strip():
-                            job_data['title'] = title.strip()
-                            break
-                except:
-                    continue
-            
-            # Extract company
-            company_selectors = [
-                '[data-testid="company-name"]',
-                '.companyName',
-                'span.companyName'
-            ]
-            
-            for selector in company_selectors:
-                try:
-                    company_elem = card.locator(selector).first
-                    if await company_elem.count() > 0:
-                        company = await company_elem.inner_text()
-                        if company and company.strip():
-                            job_data['company'] = company.strip()
-                            break
-                except:
-                    continue
-            
-            # Extract location
-            location_selectors = [
-                '[data-testid="job-location"]',
-                '.companyLocation'
-            ]
-            
-            for selector in location_selectors:
-                try:
-                    location_elem = card.locator(selector).first
-                    if await location_elem.count() > 0:
-                        location = await location_elem.inner_text()
-                        if location and location.strip():
-                            job_data['location'] = location.strip()
-                            break
-                except:
-                    continue
-            
-            # Extract salary
-            try:
-                salary_elem = card.locator('.salary-snippet, [data-testid*="salary"]').first
-                if await salary_elem.count() > 0:
-                    salary = await salary_elem.inner_text()
-                    if salary and any(currency in salary for currency in ['₦', '$', '€', '£', 'USD', 'NGN', 'GBP']):
-                        job_data['salary'] = salary.strip()
-            except:
-                pass
-            
-            # Extract job link
-            try:
-                link_elem = card.locator('h2 a[href]').first
-                if await link_elem.count() > 0:
-                    href = await link_elem.get_attribute('href')
-                    if href:
-                        if href.startswith('/'):
-                            job_data['link'] = base_url + href
-                        else:
-                            job_data['link'] = href
-                else:
-                    # Try data-jk attribute
-                    jk = await card.get_attribute('data-jk')
-                    if jk:
-                        job_data['link'] = f"{base_url}/viewjob?jk={jk}"
-            except:
-                pass
-            
-            # Extract description
-            try:
-                desc_elem = card.locator('.job-snippet, .summary').first
-                if await desc_elem.count() > 0:
-                    description = await desc_elem.inner_text()
-                    if description:
-                        job_data['description'] = description.strip()[:200]
-            except:
-                pass
-            
-            return job_data if job_data['title'] else None
-            
-        except Exception as e:
-            logger.debug(f"Error extracting job data: {str(e)}")
-            return None
+    def _build_job_from_card(self, raw_card: Dict, base_url: str) -> Optional[Dict]:
+        """Build job data from the raw fields read off a job card"""
+        job_data = {
+            'title': raw_card.get('title', ''),
+            'company': raw_card.get('company', ''),
+            'location': raw_card.get('location', ''),
+            'salary': '',
+            'link': '',
+            'description': raw_card.get('description', '')[:200],
+            'job_type': '',
+            'source': 'Indeed'
+        }
+        
+        # Keep salary only when it carries a currency
+        salary = raw_card.get('salary', '')
+        if salary and CURRENCY_PATTERN.search(salary):
+            job_data['salary'] = salary
+        
+        # Resolve job link, falling back to the data-jk job key
+        href = raw_card.get('href')
+        if href:
+            job_data['link'] = base_url + href if href.startswith('/') else href
+        elif raw_card.get('jk'):
+            job_data['link'] = f"{base_url}/viewjob?jk={raw_card['jk']}"
+        
+        return job_data if job_data['title'] else None
     
     def _is_valid_job(self, job_data: Dict) -> bool:
         """Check if job data is valid"""
         if not job_data.get('title'):
             return False
         
-        title = job_data['title'].lower()
-        
         # Filter out spam
-        spam_indicators = ['undefined', 'null', 'error', 'test job']
-        if any(spam in title for spam in spam_indicators):
+        if SPAM_TITLE_PATTERN.search(job_data['title']):
             return False
         
         if len(job_data['title']) < 5:
@@ -1,17 +1,44 @@
 import concurrent.futures
+import functools
 import logging
+import re
 import time
-from typing import List, Dict, Set
+from operator import itemgetter
+from typing import List, Dict, Set, Iterator, Tuple
 from api_manager import APIManager
 from indeed_scraper import IndeedScraper
 from jobberman_scraper import JobbermanScraper
 from proxy_manager import ProxyManager
 from user_agent_manager import UserAgentManager
-import hashlib
+from ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Nigerian place names, matched as whole words in one case-insensitive pass
+NIGERIAN_KEYWORDS = (
+    'nigeria', 'lagos', 'abuja', 'kano', 'ibadan', 'calabar', 
+    'port harcourt', 'benin city', 'jos', 'ilorin', 'owerri',
+    'enugu', 'abeokuta', 'onitsha', 'warri', 'sokoto', 'kaduna',
+    'maiduguri', 'zaria', 'katsina', 'bauchi'
+)
+NIGERIAN_LOCATION_PATTERN = re.compile(r'\b(?:' + '|'.join(map(re.escape, NIGERIAN_KEYWORDS)) + r')\b', re.IGNORECASE)
+
+# Words compared when a location only partially matches the search
+LOCATION_WORD_PATTERN = re.compile(r'\w+')
+
+# Fields every processed job carries, and the ones trimmed during cleaning
+REQUIRED_FIELDS = ('title', 'company', 'location', 'salary', 'link', 'description', 'job_type', 'source')
+STRIPPED_FIELDS = ('title', 'company', 'salary')
+
+# Cache lifetime for searches where a source failed or timed out, so the
+# missing source is retried soon instead of staying hidden for the full TTL
+PARTIAL_RESULTS_TTL = 60
+
 class JobAggregator:
+    # Processed results per search, shared across instances since the app
+    # builds a new aggregator per request
+    _results_cache = TTLCache(maxsize=256, ttl=900)
+
     def __init__(self, proxy_list: List[str] = None, **api_keys):
         # Initialize managers
         self.proxy_manager = ProxyManager(proxy_list) if proxy_list else ProxyManager()
@@ -41,6 +68,13 @@ class JobAggregator:
         all_jobs = []
         
         try:
+            cache_key = (keywords.lower().strip(), location.lower().strip(), job_type, 
+                         max_results_per_source, include_local)
+            cached_jobs = self._results_cache.get(cache_key)
+            if cached_jobs is not None:
+                logger.info(f"Search cache hit: '{keywords}' in '{location}'")
+                return [job.copy() for job in cached_jobs]
+            
             logger.info(f"Starting job search: '{keywords}' in '{location}'")
             
             # Determine search strategy
@@ -52,15 +86,21 @@ class JobAggregator:
                 is_nigerian_search, include_local
             )
             
-            # Execute searches with thread-safe timeout control
-            all_jobs = self._execute_searches_thread_safe(search_tasks)
+            # Execute searches with thread-safe timeout control (results arrive deduplicated)
+            incomplete_sources = []
+            all_jobs = self._execute_searches_thread_safe(search_tasks, incomplete_sources)
             
             # Process results
-            unique_jobs = self._deduplicate_jobs(all_jobs)
-            processed_jobs = self._process_jobs(unique_jobs, location)
+            processed_jobs = self._process_jobs(all_jobs, location)
             
             total_time = time.time() - start_time
-            logger.info(f"Search completed in {total_time:.1f}s: {len(all_jobs)} total, {len(unique_jobs)} unique jobs")
+            logger.info(f"Search completed in {total_time:.1f}s: {len(all_jobs)} unique jobs")
+            
+            # Only cache searches that found something so empty runs are retried,
+            # and only briefly when a source failed or timed out
+            if processed_jobs:
+                ttl = PARTIAL_RESULTS_TTL if incomplete_sources else None
+                self._results_cache.set(cache_key, [job.copy() for job in processed_jobs], ttl=ttl)
             
             return processed_jobs
             
@@ -71,10 +111,24 @@ class JobAggregator:
             
             # Return what we have so far
             if all_jobs:
-                unique_jobs = self._deduplicate_jobs(all_jobs)
-                return self._process_jobs(unique_jobs, location)
+                return self._process_jobs(all_jobs, location)
             return []
     
+    def search_all_sources_stream(self, keywords: str, location: str = '', job_type: str = '', 
+                                  max_results_per_source: int = 10, include_local: bool = False) -> Iterator[List[Dict]]:
+        """Yield cleaned and scored jobs from each source as soon as it finishes"""
+        logger.info(f"Starting streamed job search: '{keywords}' in '{location}'")
+        
+        search_tasks = self._build_search_tasks(
+            keywords, location, job_type, max_results_per_source, 
+            self._is_nigerian_location(location), include_local
+        )
+        
+        # Batches are ranked individually; duplicates of earlier batches are never re-sent
+        for _, new_jobs in self._iter_search_results(search_tasks):
+            if new_jobs:
+                yield self._process_jobs(new_jobs, location)
+    
     def _build_search_tasks(self, keywords: str, location: str, job_type: str, 
                            max_results_per_source: int, is_nigerian_search: bool, include_local: bool) -> List:
         """Build list of search tasks"""
@@ -104,11 +158,22 @@ class JobAggregator:
         
         return api_tasks + scraper_tasks
     
-    def _execute_searches_thread_safe(self, search_tasks: List) -> List[Dict]:
+    def _execute_searches_thread_safe(self, search_tasks: List, incomplete_sources: List[str] = None) -> List[Dict]:
         """Execute searches with thread-safe timeout control"""
         all_jobs = []
+        for _, new_jobs in self._iter_search_results(search_tasks, incomplete_sources):
+            all_jobs.extend(new_jobs)
+        return all_jobs
+    
+    def _iter_search_results(self, search_tasks: List, incomplete_sources: List[str] = None) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield (source name, deduplicated new jobs) as each source finishes, noting failed or timed-out sources"""
+        if incomplete_sources is None:
+            incomplete_sources = []
+        seen_jobs: Set[tuple] = set()
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        # One worker per source so every search starts immediately
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(search_tasks))
+        try:
             # Submit all tasks
             future_to_source = {}
             for task in search_tasks:
@@ -117,45 +182,63 @@ class JobAggregator:
                 future = executor.submit(self._safe_search, search_func, *args)
                 future_to_source[future] = (source_name, timeout)
             
-            # Collect results with individual timeouts
-            for future in concurrent.futures.as_completed(future_to_source, timeout=self.max_total_time):
-                source_name, timeout = future_to_source[future]
-                try:
-                    source_jobs = future.result(timeout=timeout)
+            # Collect results as each source finishes, enforcing every source's own timeout
+            start_time = time.monotonic()
+            deadlines = {
+                future: start_time + min(timeout, self.max_total_time)
+                for future, (_, timeout) in future_to_source.items()
+            }
+            pending = set(future_to_source)
+            while pending:
+                wait_time = max(0, min(deadlines[future] for future in pending) - time.monotonic())
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=wait_time, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                
+                for future in done:
+                    source_name, _ = future_to_source[future]
+                    try:
+                        source_jobs = future.result()
+                    except Exception as e:
+                        logger.error(f"{source_name} failed: {str(e)}")
+                        incomplete_sources.append(source_name)
+                        continue
+                    
                     if source_jobs:
-                        all_jobs.extend(source_jobs)
-                        logger.info(f"{source_name}: Found {len(source_jobs)} jobs")
+                        # Deduplicate as each source lands so duplicates are never held
+                        new_jobs = self._deduplicate_jobs(source_jobs, seen_jobs)
+                        logger.info(f"{source_name}: Found {len(source_jobs)} jobs ({len(new_jobs)} new)")
+                        yield source_name, new_jobs
                     else:
                         logger.info(f"{source_name}: Found 0 jobs")
-                except concurrent.futures.TimeoutError:
-                    logger.warning(f"{source_name} timed out after {timeout}s")
-                except Exception as e:
-                    logger.error(f"{source_name} failed: {str(e)}")
-        
-        return all_jobs
+                
+                # Stop waiting on sources that have used up their timeout
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[f] <= now]:
+                    pending.discard(future)
+                    source_name, timeout = future_to_source[future]
+                    logger.warning(f"{source_name} timed out after {min(timeout, self.max_total_time)}s")
+                    incomplete_sources.append(source_name)
+        finally:
+            # Don't hold the response open for sources that missed the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def _safe_search(self, search_func, *args):
-        """Execute search function with error handling"""
-        try:
-            result = search_func(*args)
-            return result if result else []
-        except Exception as e:
-            logger.error(f"Search function {search_func.__name__} error: {str(e)}")
-            return []
+        """Execute search function, treating a missing result as no jobs"""
+        # Errors propagate so _iter_search_results logs the source and marks it incomplete
+        result = search_func(*args)
+        return result if result else []
     
-    def _is_nigerian_location(self, location: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _is_nigerian_location(location: str) -> bool:
         """Check if location is in Nigeria"""
-        nigerian_keywords = [
-            'nigeria', 'lagos', 'abuja', 'kano', 'ibadan', 'calabar', 
-            'port harcourt', 'benin city', 'jos', 'ilorin', 'owerri',
-            'enugu', 'abeokuta', 'onitsha', 'warri', 'sokoto', 'kaduna',
-            'maiduguri', 'zaria', 'katsina', 'bauchi'
-        ]
-        return any(keyword in location.lower() for keyword in nigerian_keywords)
+        return NIGERIAN_LOCATION_PATTERN.search(location) is not None
     
-    def _deduplicate_jobs(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on title and company"""
-        seen_jobs: Set[str] = set()
+    def _deduplicate_jobs(self, jobs: List[Dict], seen_jobs: Set[tuple] = None) -> List[Dict]:
+        """Remove duplicate jobs based on title and company, updating seen_jobs"""
+        if seen_jobs is None:
+            seen_jobs = set()
         unique_jobs = []
         
         for job in jobs:
@@ -167,80 +250,64 @@ class JobAggregator:
         
         return unique_jobs
     
-    def _create_job_hash(self, job: Dict) -> str:
-        """Create unique hash for job deduplication"""
-        key_parts = [
+    def _create_job_hash(self, job: Dict) -> tuple:
+        """Create unique key for job deduplication"""
+        return (
             job.get('title', '').lower().strip(),
             job.get('company', '').lower().strip(),
             job.get('location', '').lower().strip()[:20]
-        ]
-        key_string = '|'.join(key_parts)
-        return hashlib.md5(key_string.encode()).hexdigest()
+        )
     
     def _process_jobs(self, jobs: List[Dict], search_location: str) -> List[Dict]:
-        """Process and rank jobs"""
-        processed_jobs = []
+        """Clean, score and rank already-deduplicated jobs in a single pass"""
+        # Search-side inputs are constant for the batch, so resolve them once
+        search_location_lower = search_location.lower()
+        search_tokens = self._location_tokens(search_location_lower)
+        is_nigerian_search = self._is_nigerian_location(search_location)
         
         for job in jobs:
-            # Clean up job data
-            processed_job = self._clean_job_data(job)
-            
-            # Add relevance score
-            processed_job['relevance_score'] = self._calculate_relevance(processed_job, search_location)
-            
-            processed_jobs.append(processed_job)
+            self._clean_job_data(job)
+            job['relevance_score'] = self._calculate_relevance(job, search_location_lower, search_tokens, is_nigerian_search)
         
         # Sort by relevance score (highest first)
-        processed_jobs.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+        jobs.sort(key=itemgetter('relevance_score'), reverse=True)
         
-        return processed_jobs
+        return jobs
     
     def _clean_job_data(self, job: Dict) -> Dict:
-        """Clean and standardize job data"""
-        cleaned = job.copy()
-        
-        # Clean title
-        if cleaned.get('title'):
-            cleaned['title'] = cleaned['title'].strip()
+        """Clean and standardize job data in place"""
+        # Trim surrounding whitespace
+        for field in STRIPPED_FIELDS:
+            value = job.get(field)
+            if value:
+                job[field] = value.strip()
         
-        # Clean company
-        if cleaned.get('company'):
-            cleaned['company'] = cleaned['company'].strip()
-        
-        # Clean location
-        if cleaned.get('location'):
-            location = cleaned['location'].strip()
-            location = ' '.join(location.split())
-            cleaned['location'] = location
+        # Collapse whitespace inside location
+        location = job.get('location')
+        if location:
+            job['location'] = ' '.join(location.split())
         
         # Ensure all required fields exist
-        required_fields = ['title', 'company', 'location', 'salary', 'link', 'description', 'job_type', 'source']
-        for field in required_fields:
-            if field not in cleaned:
-                cleaned[field] = ''
+        for field in REQUIRED_FIELDS:
+            job.setdefault(field, '')
         
-        return cleaned
+        return job
     
-    def _calculate_relevance(self, job: Dict, search_location: str) -> float:
-        """Calculate job relevance score"""
+    def _calculate_relevance(self, job: Dict, search_location_lower: str, search_tokens: frozenset, 
+                             is_nigerian_search: bool) -> float:
+        """Calculate relevance score for a cleaned job against a lowercased search location"""
         score = 1.0
         
         # Location matching bonus
-        if search_location and job.get('location'):
-            job_location = job['location'].lower()
-            search_location_lower = search_location.lower()
-            
-            if search_location_lower in job_location:
-                score += 2.0
-            elif any(word in job_location for word in search_location_lower.split()):
-                score += 1.0
+        if search_location_lower and job['location']:
+            score += self._location_bonus(job['location'], search_location_lower, search_tokens)
         
         # Salary information bonus
-        if job.get('salary') and job['salary'].strip():
+        if job['salary']:
             score += 1.5
         
         # Description length bonus
-        if job.get('description'):
+        if job['description']:
             desc_len = len(job['description'])
             if desc_len > 100:
                 score += 1.0
@@ -248,7 +315,24 @@ class JobAggregator:
                 score += 0.5
         
         # Nigerian job bonus if searching in Nigeria
-        if self._is_nigerian_location(search_location) and job.get('source') == 'Jobberman':
+        if is_nigerian_search and job['source'] == 'Jobberman':
             score += 1.0
         
         return score
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _location_bonus(job_location: str, search_location_lower: str, search_tokens: frozenset) -> float:
+        """Score how well a job location matches the lowercased search location"""
+        job_location = job_location.lower()
+        
+        if search_location_lower in job_location:
+            return 2.0
+        if not search_tokens.isdisjoint(JobAggregator._location_tokens(job_location)):
+            return 1.0
+        return 0.0
+    
+    @staticmethod
+    def _location_tokens(location_lower: str) -> frozenset:
+        """Split a lowercased location into words, ignoring punctuation and single letters"""
+        return frozenset(word for word in LOCATION_WORD_PATTERN.findall(location_lower) if len(word) > 1)
@@ -1,21 +1,187 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-import time
-import random
+import soupsieve as sv
+import concurrent.futures
+import functools
 import logging
+import re
+import threading
+import time
+from types import MappingProxyType
 from urllib.parse import urlencode, urljoin
 from typing import List, Dict, Optional
 from proxy_manager import ProxyManager
 from user_agent_manager import UserAgentManager
+from ttl_cache import TTLCache
+
+# Prefer the C-backed lxml tree builder, falling back to the stdlib parser
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
 logger = logging.getLogger(__name__)
 
+# Static request headers, set once on each shared session; only the
+# User-Agent is sent per request
+REQUEST_HEADERS = MappingProxyType({
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Cache-Control': 'no-cache'
+})
+
+# Longest Retry-After the fetch will sleep for; servers can ask for minutes
+RETRY_AFTER_CAP = 3
+
+class _CappedRetry(Retry):
+    """Retry that honours Retry-After but never sleeps longer than RETRY_AFTER_CAP"""
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, RETRY_AFTER_CAP)
+
+# Transient failures get one retry from the adapter: a failed connect or a
+# 429/5xx status (after a capped Retry-After). Read timeouts are not retried
+FETCH_RETRY = _CappedRetry(
+    total=1,
+    connect=1,
+    read=0,
+    status=1,
+    backoff_factor=1.5,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({'GET'}),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# (connect, read) timeouts per attempt. Worst case is two attempts of
+# 3 + 8s around a 3s Retry-After sleep, about 25s, the aggregator's scraper
+# budget; a slow response that keeps trickling bytes can still run longer
+FETCH_TIMEOUT = (3, 8)
+
+# Page chrome removed before looking for job containers
+UNWANTED_SELECTOR = sv.compile('nav, header, footer, aside, .sidebar, .nav, .menu, .filter')
+
+# Selectors tried in priority order; the first match wins, so they stay
+# separate rather than joined into one selector group. All are compiled
+# once here instead of being looked up by string on every card
+JOB_CONTAINER_SELECTORS = tuple(sv.compile(selector) for selector in (
+    'article[class*="job"]',
+    'div[class*="job-card"]',
+    'div[class*="search-result"]',
+    'li[class*="job"]',
+    '.job-item',
+    '.listing'
+))
+TITLE_SELECTORS = tuple(sv.compile(selector) for selector in (
+    'h1 a', 'h2 a', 'h3 a', 'h4 a',
+    'a[href*="/job/"]',
+    'a[href*="/jobs/"]',
+    '.job-title a',
+    '.title a'
+))
+COMPANY_SELECTORS = tuple(sv.compile(selector) for selector in (
+    '.company-name',
+    '.employer',
+    '.company',
+    '[class*="company"]',
+    'span.company'
+))
+LOCATION_SELECTORS = tuple(sv.compile(selector) for selector in (
+    '.location',
+    '.job-location',
+    '[class*="location"]'
+))
+
+# Nigerian cities accepted in a job's location, matched as whole words
+NIGERIAN_CITY_PATTERN = re.compile(r'\b(?:lagos|abuja|nigeria|calabar|kano|ibadan|port harcourt)\b', re.IGNORECASE)
+
+# Display names for Nigerian locations, checked in order
+NIGERIAN_CITY_NAMES = MappingProxyType({
+    'lagos': 'Lagos',
+    'abuja': 'Abuja',
+    'calabar': 'Calabar',
+    'port harcourt': 'Port Harcourt',
+    'kano': 'Kano',
+    'ibadan': 'Ibadan',
+    'nigeria': 'Nigeria'
+})
+
+# Keywords that show a fetched page carries job listings
+JOB_PAGE_INDICATOR_PATTERN = re.compile(rb'salary|apply|company|position|experience|qualification', re.IGNORECASE)
+
+# Job keywords and navigation/UI phrases, each list scanned in a single regex pass
+JOB_KEYWORD_PATTERN = re.compile('apply|salary|experience|qualification|job|position|role', re.IGNORECASE)
+NAVIGATION_PATTERN = re.compile(
+    'search filter|homepage|find a job|jobs found|filter applied|sort by|view all|load more|'
+    'sign in|register|login|create account|terms|privacy|cookie|contact us',
+    re.IGNORECASE
+)
+UI_ELEMENT_PATTERN = re.compile(
+    'search filter|homepage|find a job|jobs found|filters? applied|sort by|view all|'
+    'load more|sign in|register|login|create account|jobs in nigeria|any job function|'
+    'refine search|browse|categories|popular searches'
+)
+COMPANY_UI_PATTERN = re.compile('filter|search|homepage|jobs found', re.IGNORECASE)
+
+# Lines mentioning pay that also contain a digit
+SALARY_LINE_PATTERN = re.compile(r'^(?=.*\d).*(?:₦|NGN|naira|salary|\$|per month|per annum).*$', re.MULTILINE)
+
+# Role and industry words that mark a title as a real job, matched as whole words
+JOB_TITLE_WORDS = frozenset({
+    'manager', 'officer', 'executive', 'assistant', 'specialist',
+    'engineer', 'developer', 'analyst', 'coordinator', 'supervisor',
+    'director', 'consultant', 'representative', 'administrator',
+    'accountant', 'designer', 'marketer', 'sales', 'hr', 'it',
+    'intern', 'graduate', 'senior', 'junior', 'lead'
+})
+WORD_PATTERN = re.compile(r'[a-z]+')
+
+def _build_session() -> requests.Session:
+    """Build the keep-alive session shared by all Jobberman fetches"""
+    session = requests.Session()
+    # Every request goes to the one Jobberman host, so a single pool is enough
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=FETCH_RETRY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(REQUEST_HEADERS)
+    return session
+
+# Shared across scraper instances (one is built per request) so the TLS
+# connection to Jobberman is reused between searches; fetches go direct
+_SESSION = _build_session()
+
+# Minimum spacing between Jobberman requests across all scraper instances; a
+# request only waits when another one went out less than this long ago
+MIN_REQUEST_INTERVAL = 0.5
+_next_request_time = 0.0
+_RATE_LIMIT_LOCK = threading.Lock()
+
+def _rate_limit():
+    """Wait for the next free request slot, reserving it so concurrent callers queue up"""
+    global _next_request_time
+    with _RATE_LIMIT_LOCK:
+        now = time.monotonic()
+        slot = max(now, _next_request_time)
+        _next_request_time = slot + MIN_REQUEST_INTERVAL
+    
+    if slot > now:
+        time.sleep(slot - now)
+
 class JobbermanScraper:
+    # Parsed results per (keywords, max results), shared across instances;
+    # location and job type do not change the Jobberman URLs
+    _results_cache = TTLCache(maxsize=256, ttl=3600)
+
     def __init__(self, proxy_manager: ProxyManager, user_agent_manager: UserAgentManager):
         self.proxy_manager = proxy_manager
         self.ua_manager = user_agent_manager
         self.base_url = 'https://www.jobberman.com'
-        self.session = requests.Session()
     
     def search_jobs(self, keywords: str, location: str = '', job_type: str = '', 
                    max_results: int = 10) -> List[Dict]:
@@ -25,6 +191,12 @@ class JobbermanScraper:
             # Enhanced Nigerian location handling
             search_location = self._format_nigerian_location(location)
             
+            cache_key = (keywords.lower().strip(), max_results)
+            cached_jobs = self._results_cache.get(cache_key)
+            if cached_jobs is not None:
+                logger.info(f"Jobberman cache hit: {keywords}")
+                return [job.copy() for job in cached_jobs]
+            
             # Try multiple URL patterns
             search_urls = [
                 f"{self.base_url}/jobs?q={keywords.replace(' ', '+')}",
@@ -33,15 +205,27 @@ class JobbermanScraper:
             
             logger.info(f"Searching Jobberman for: {keywords} in {search_location}")
             
-            # Try each URL pattern
-            for search_url in search_urls:
-                html_content = self._fetch_page(search_url)
+            # Fetch every URL pattern at once and keep the first that yields jobs
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(search_urls))
+            try:
+                future_to_url = {executor.submit(self._fetch_page, url): url for url in search_urls}
                 
-                if html_content and self._is_valid_html(html_content):
-                    jobs = self._parse_real_jobs(html_content, max_results)
-                    if jobs:
-                        logger.info(f"Success with URL: {search_url}")
-                        break
+                for future in concurrent.futures.as_completed(future_to_url):
+                    search_url = future_to_url[future]
+                    html_content = future.result()
+                    
+                    if html_content and self._is_valid_html(html_content):
+                        jobs = self._parse_real_jobs(html_content, max_results)
+                        if jobs:
+                            logger.info(f"Success with URL: {search_url}")
+                            break
+            finally:
+                # Don't wait on the slower pattern once one has produced jobs
+                executor.shutdown(wait=False, cancel_futures=True)
+            
+            # Only cache successful scrapes so empty or failed fetches are retried
+            if jobs:
+                self._results_cache.set(cache_key, [job.copy() for job in jobs])
                                 
         except Exception as e:
             logger.error(f"Error scraping Jobberman: {str(e)}")
@@ -49,113 +233,96 @@ class JobbermanScraper:
         logger.info(f"Jobberman scraper found {len(jobs)} jobs")
         return jobs
     
-    def _format_nigerian_location(self, location: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _format_nigerian_location(location: str) -> str:
         """Format Nigerian locations properly"""
         if not location:
             return 'Nigeria'
         
-        nigerian_cities = {
-            'lagos': 'Lagos',
-            'abuja': 'Abuja',
-            'calabar': 'Calabar',
-            'port harcourt': 'Port Harcourt',
-            'kano': 'Kano',
-            'ibadan': 'Ibadan',
-            'nigeria': 'Nigeria'
-        }
-        
         location_lower = location.lower().strip()
-        for key, formatted in nigerian_cities.items():
+        for key, formatted in NIGERIAN_CITY_NAMES.items():
             if key in location_lower:
                 return formatted
         
         return location
     
-    def _is_valid_html(self, html_content: str) -> bool:
+    def _is_valid_html(self, html_content: bytes) -> bool:
         """Check if HTML contains actual job content"""
         if not html_content or len(html_content) < 1000:
             return False
         
-        # Check for job-related keywords
-        job_indicators = ['salary', 'apply', 'company', 'position', 'experience', 'qualification']
-        content_lower = html_content.lower()
-        
-        indicator_count = sum(1 for indicator in job_indicators if indicator in content_lower)
-        return indicator_count >= 3
+        # Stop scanning as soon as three distinct job keywords have been seen
+        found = set()
+        for match in JOB_PAGE_INDICATOR_PATTERN.finditer(html_content):
+            found.add(match.group().lower())
+            if len(found) >= 3:
+                return True
+        return False
     
-    def _fetch_page(self, url: str, max_retries: int = 2) -> Optional[str]:
-        """Fetch page with minimal retries"""
-        for attempt in range(max_retries):
-            try:
-                # Simple request without proxy for speed
-                headers = {
-                    'User-Agent': self.ua_manager.get_random_user_agent(),
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'Connection': 'keep-alive',
-                    'Cache-Control': 'no-cache'
-                }
-                
-                time.sleep(random.uniform(1, 2))
-                
-                response = self.session.get(
-                    url,
-                    headers=headers,
-                    timeout=15,
-                    allow_redirects=True
-                )
+    def _fetch_page(self, url: str) -> Optional[bytes]:
+        """Fetch raw page bytes; transient failures are retried by the session adapter"""
+        try:
+            # Simple request without proxy for speed; static headers live on the session
+            headers = {'User-Agent': self.ua_manager.get_random_user_agent()}
+            
+            _rate_limit()
+            
+            response = _SESSION.get(
+                url,
+                headers=headers,
+                timeout=FETCH_TIMEOUT,
+                allow_redirects=True
+            )
+            
+            if response.status_code == 200:
+                # Hand raw bytes to the parser and skip requests' text decode
+                return response.content
+            elif response.status_code in [404, 410]:
+                logger.debug(f"URL not found ({response.status_code}): {url}")
+            else:
+                logger.debug(f"HTTP {response.status_code} for {url}")
                 
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code in [404, 410]:
-                    logger.debug(f"URL not found ({response.status_code}): {url}")
-                    return None
-                else:
-                    logger.debug(f"HTTP {response.status_code} for {url}")
-                    
-            except Exception as e:
-                logger.debug(f"Fetch attempt {attempt + 1} failed: {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(random.uniform(2, 4))
+        except Exception as e:
+            logger.debug(f"Fetch failed for {url}: {str(e)}")
         
         return None
     
-    def _parse_real_jobs(self, html_content: str, max_results: int) -> List[Dict]:
+    def _parse_real_jobs(self, html_content: bytes, max_results: int) -> List[Dict]:
         """Parse only real jobs, filtering out navigation and UI elements"""
         jobs = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Remove navigation, headers, footers, and sidebars first
-        for unwanted in soup.select('nav, header, footer, aside, .sidebar, .nav, .menu, .filter'):
+        for unwanted in UNWANTED_SELECTOR.select(soup):
             unwanted.decompose()
         
         # Look for job-specific containers with stricter rules
-        job_selectors = [
-            'article[class*="job"]',
-            'div[class*="job-card"]',
-            'div[class*="search-result"]',
-            'li[class*="job"]',
-            '.job-item',
-            '.listing'
-        ]
-        
+        # (element, text) pairs; text is filled in when already extracted
         potential_jobs = []
-        for selector in job_selectors:
-            elements = soup.select(selector)
+        for selector in JOB_CONTAINER_SELECTORS:
+            elements = selector.select(soup)
             if elements:
-                logger.debug(f"Found {len(elements)} potential jobs with: {selector}")
-                potential_jobs.extend(elements)
+                logger.debug(f"Found {len(elements)} potential jobs with: {selector.pattern}")
+                potential_jobs.extend((element, None) for element in elements)
                 break
         
-        # If no specific job containers, look for divs with job-like content
+        # Check more elements than needed, since some fail validation
+        max_candidates = max_results * 3
+        
+        # If no specific job containers, look for divs with job-like content,
+        # stopping once enough candidates are collected
         if not potential_jobs:
-            all_divs = soup.find_all(['div', 'article', 'li'])
-            potential_jobs = [div for div in all_divs if self._looks_like_job(div)]
+            for div in soup.find_all(['div', 'article', 'li']):
+                text = div.get_text()
+                if self._looks_like_job(div, text):
+                    potential_jobs.append((div, text))
+                    if len(potential_jobs) >= max_candidates:
+                        break
         
         # Extract and validate jobs
-        for element in potential_jobs[:max_results * 3]:  # Check more elements
-            job_data = self._extract_job_data_strict(element)
+        for element, text in potential_jobs[:max_candidates]:
+            job_data = self._extract_job_data_strict(element, text)
             
             if job_data and self._is_real_job(job_data):
                 jobs.append(job_data)
@@ -165,36 +332,24 @@ class JobbermanScraper:
         
         return jobs
     
-    def _looks_like_job(self, element) -> bool:
-        """Check if element looks like a job posting"""
+    def _looks_like_job(self, element, text: str) -> bool:
+        """Check if element (whose get_text() is text) looks like a job posting"""
         try:
-            text = element.get_text().lower()
-            
-            # Must have reasonable length
+            # Must have reasonable length (checked before any pattern work)
             if len(text) < 50 or len(text) > 2000:
                 return False
             
-            # Must have job-related keywords
-            job_keywords = ['apply', 'salary', 'experience', 'qualification', 'job', 'position', 'role']
-            keyword_count = sum(1 for keyword in job_keywords if keyword in text)
-            
-            if keyword_count < 2:
+            # Must have at least two distinct job-related keywords
+            keywords_found = {keyword.lower() for keyword in JOB_KEYWORD_PATTERN.findall(text)}
+            if len(keywords_found) < 2:
                 return False
             
             # Must NOT be navigation or UI elements
-            navigation_keywords = [
-                'search filter', 'homepage', 'find a job', 'jobs found',
-                'filter applied', 'sort by', 'view all', 'load more',
-                'sign in', 'register', 'login', 'create account',
-                'terms', 'privacy', 'cookie', 'contact us'
-            ]
-            
-            if any(nav_keyword in text for nav_keyword in navigation_keywords):
+            if NAVIGATION_PATTERN.search(text):
                 return False
             
-            # Must have links (job postings have apply links)
-            links = element.find_all('a', href=True)
-            if len(links) < 1:
+            # Must have links (job postings have apply links); the first one is enough
+            if element.find('a', href=True) is None:
                 return False
             
             return True
@@ -202,7 +357,7 @@ class JobbermanScraper:
         except Exception:
             return False
     
-    def _extract_job_data_strict(self, element) -> Optional[Dict]:
+    def _extract_job_data_strict(self, element, text_content: Optional[str] = None) -> Optional[Dict]:
         """Extract job data with strict validation to avoid UI elements"""
         try:
             job_data = {
@@ -217,16 +372,8 @@ class JobbermanScraper:
             }
             
             # Extract title - must be substantial and not a UI element
-            title_selectors = [
-                'h1 a', 'h2 a', 'h3 a', 'h4 a',
-                'a[href*="/job/"]',
-                'a[href*="/jobs/"]',
-                '.job-title a',
-                '.title a'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = element.select_one(selector)
+            for selector in TITLE_SELECTORS:
+                title_elem = selector.select_one(element)
                 if title_elem:
                     title_text = title_elem.get_text(strip=True)
                     
@@ -239,6 +386,9 @@ class JobbermanScraper:
                         if href:
                             if href.startswith('http'):
                                 job_data['link'] = href
+                            elif href.startswith('/') and not href.startswith('//'):
+                                # Root-relative links (the common case) need no URL parsing
+                                job_data['link'] = self.base_url + href
                             else:
                                 job_data['link'] = urljoin(self.base_url, href)
                         break
@@ -248,49 +398,34 @@ class JobbermanScraper:
                 return None
             
             # Extract company - look for company-specific patterns
-            company_selectors = [
-                '.company-name',
-                '.employer',
-                '.company',
-                '[class*="company"]',
-                'span.company'
-            ]
-            
-            for selector in company_selectors:
-                company_elem = element.select_one(selector)
+            for selector in COMPANY_SELECTORS:
+                company_elem = selector.select_one(element)
                 if company_elem:
                     company_text = company_elem.get_text(strip=True)
                     if company_text and len(company_text) > 1 and len(company_text) < 100:
                         # Skip if it's a UI element
-                        if not any(ui_word in company_text.lower() for ui_word in ['filter', 'search', 'homepage', 'jobs found']):
+                        if not COMPANY_UI_PATTERN.search(company_text):
                             job_data['company'] = company_text
                             break
             
             # Extract location
-            location_selectors = [
-                '.location',
-                '.job-location',
-                '[class*="location"]'
-            ]
-            
-            for selector in location_selectors:
-                location_elem = element.select_one(selector)
+            for selector in LOCATION_SELECTORS:
+                location_elem = selector.select_one(element)
                 if location_elem:
                     location_text = location_elem.get_text(strip=True)
-                    if location_text and any(nigerian_city in location_text.lower() for nigerian_city in ['lagos', 'abuja', 'nigeria', 'calabar', 'kano', 'ibadan', 'port harcourt']):
+                    if location_text and NIGERIAN_CITY_PATTERN.search(location_text):
                         job_data['location'] = location_text
                         break
             
-            # Extract salary
-            salary_keywords = ['₦', 'NGN', 'naira', 'salary', '$', 'per month', 'per annum']
-            text_content = element.get_text()
+            # Extract salary: first short line with both a salary marker and a digit
+            if text_content is None:
+                text_content = element.get_text()
             
-            for line in text_content.split('\n'):
-                if any(keyword in line for keyword in salary_keywords):
-                    cleaned_line = line.strip()
-                    if len(cleaned_line) < 50 and any(char.isdigit() for char in cleaned_line):
-                        job_data['salary'] = cleaned_line
-                        break
+            for match in SALARY_LINE_PATTERN.finditer(text_content):
+                cleaned_line = match.group().strip()
+                if len(cleaned_line) < 50:
+                    job_data['salary'] = cleaned_line
+                    break
             
             # Extract description - get meaningful text
             paragraphs = element.find_all('p')
@@ -306,7 +441,9 @@ class JobbermanScraper:
             logger.debug(f"Error extracting job data: {str(e)}")
             return None
     
-    def _is_valid_job_title(self, title: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _is_valid_job_title(title: str) -> bool:
         """Validate that title is a real job title, not UI element"""
         if not title or len(title) < 5:
             return False
@@ -317,27 +454,11 @@ class JobbermanScraper:
         title_lower = title.lower()
         
         # Reject obvious UI elements
-        ui_elements = [
-            'search filter', 'homepage', 'find a job', 'jobs found',
-            'filter applied', 'filters applied', 'sort by', 'view all',
-            'load more', 'sign in', 'register', 'login', 'create account',
-            'jobs in nigeria', 'any job function', 'refine search',
-            'browse', 'categories', 'popular searches'
-        ]
-        
-        if any(ui_elem in title_lower for ui_elem in ui_elements):
+        if UI_ELEMENT_PATTERN.search(title_lower):
             return False
         
         # Must contain job-related words or industry terms
-        job_indicators = [
-            'manager', 'officer', 'executive', 'assistant', 'specialist',
-            'engineer', 'developer', 'analyst', 'coordinator', 'supervisor',
-            'director', 'consultant', 'representative', 'administrator',
-            'accountant', 'designer', 'marketer', 'sales', 'hr', 'it',
-            'intern', 'graduate', 'senior', 'junior', 'lead'
-        ]
-        
-        has_job_indicator = any(indicator in title_lower for indicator in job_indicators)
+        has_job_indicator = not JOB_TITLE_WORDS.isdisjoint(WORD_PATTERN.findall(title_lower))
         
         # If no specific indicator, at least check it's not pure navigation
         if not has_job_indicator:
@@ -1,11 +1,87 @@
+import concurrent.futures
+import heapq
+import itertools
+import json
+import os
 import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import parse_url
 import logging
+import threading
 import time
 from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Consecutive request failures before a proxy is taken out of rotation
+PROXY_FAILURE_THRESHOLD = 3
+
+# A working proxy not confirmed within this many seconds gets a quick probe
+# before it is handed out; nothing reports request outcomes for it yet
+PROXY_RECHECK_INTERVAL = 60
+PROXY_PROBE_TIMEOUT = 3
+
+def _build_session() -> requests.Session:
+    """Build the keep-alive session shared by all proxy probes"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Each time a proxy is handed out its effective latency grows by this
+# factor, so the fastest proxies are used first but load still spreads
+LATENCY_SPREAD = 1.05
+
+# Proxies probed at once during a refresh
+REFRESH_WORKERS = 20
+
+# Latency-ranked working proxies saved by each refresh, so a new manager
+# (or a restarted process) can skip the initial probe while it is fresh
+PROXY_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.proxy_cache.json')
+PROXY_CACHE_TTL = 3600
+
+# Parsed (ip:port, latency, tested at) cache entries shared by every manager,
+# keyed on the file's mtime so the file is only re-read after a refresh rewrites it
+_proxy_cache_memo = (None, [])
+_PROXY_CACHE_LOCK = threading.Lock()
+# Serialises the read-merge-write of a save within this process
+_PROXY_CACHE_SAVE_LOCK = threading.Lock()
+
+def _read_proxy_cache() -> list:
+    """Get the saved (ip:port, latency, tested at) entries tested within the TTL"""
+    global _proxy_cache_memo
+    try:
+        mtime = os.path.getmtime(PROXY_CACHE_PATH)
+    except OSError:
+        return []
+    if time.time() - mtime > PROXY_CACHE_TTL:
+        return []
+    
+    with _PROXY_CACHE_LOCK:
+        if _proxy_cache_memo[0] != mtime:
+            try:
+                with open(PROXY_CACHE_PATH) as f:
+                    cached = json.load(f)
+                entries = [
+                    (str(entry['proxy']), float(entry['latency']), float(entry.get('tested_at', mtime)))
+                    for entry in cached
+                ]
+            except (OSError, ValueError, KeyError, TypeError):
+                # Unreadable cache; the next refresh rewrites it
+                entries = []
+            _proxy_cache_memo = (mtime, entries)
+        entries = _proxy_cache_memo[1]
+    
+    # Entries kept from other managers' refreshes age out individually
+    oldest = time.time() - PROXY_CACHE_TTL
+    return [entry for entry in entries if entry[2] >= oldest]
+
+# Shared across ProxyManager instances so repeated probes through the same
+# proxy reuse its open connection instead of reconnecting every time
+_SESSION = _build_session()
+
 class ProxyManager:
     def __init__(self, proxy_list: List[str] = None):
         """
@@ -16,30 +92,36 @@ class ProxyManager:
         self.failed_proxies = []
         self.current_index = 0
         self.last_test_time = 0
+        self.failure_counts = {}
+        self.last_success_times = {}
+        # (effective latency, tiebreaker, proxy) for working proxies, fastest first
+        self._latency_heap = []
+        self._heap_counter = itertools.count()
+        self._heap_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
         if proxy_list:
             self.load_proxies(proxy_list)
+            self._load_cached_proxies()
     
     def load_proxies(self, proxy_list: List[str]):
         """Load proxies from list"""
+        loaded = {proxy['raw'] for proxy in self.proxies}
         for proxy_string in proxy_list:
             try:
-                parts = proxy_string.strip().split(':')
-                if len(parts) >= 2:
+                raw = proxy_string.strip()
+                parts = raw.split(':')
+                if len(parts) >= 2 and raw not in loaded:
                     if len(parts) == 4:  # With auth
                         ip, port, username, password = parts
-                        proxy_dict = {
-                            'http': f'http://{username}:{password}@{ip}:{port}',
-                            'https': f'http://{username}:{password}@{ip}:{port}',
-                            'raw': proxy_string.strip()
-                        }
+                        url = f'http://{username}:{password}@{ip}:{port}'
                     else:  # Without auth
                         ip, port = parts[:2]
-                        proxy_dict = {
-                            'http': f'http://{ip}:{port}',
-                            'https': f'http://{ip}:{port}',
-                            'raw': proxy_string.strip()
-                        }
-                    self.proxies.append(proxy_dict)
+                        url = f'http://{ip}:{port}'
+                    
+                    # Reject malformed hosts and ports now rather than on every request
+                    parse_url(url)
+                    self.proxies.append({'http': url, 'https': url, 'raw': raw})
+                    loaded.add(raw)
             except Exception as e:
                 logger.warning(f"Failed to parse proxy {proxy_string}: {e}")
         
@@ -62,71 +144,188 @@ class ProxyManager:
             return None
         
         proxy_list = self.working_proxies if self.working_proxies else self.proxies
-        proxy = proxy_list[self.current_index]
-        self.current_index = (self.current_index + 1) % len(proxy_list)
+        # The list may have shrunk since the last call, so wrap the index first
+        index = self.current_index % len(proxy_list)
+        proxy = proxy_list[index]
+        self.current_index = index + 1
         return proxy
     
-    def test_proxy(self, proxy_dict: Dict[str, str], timeout: int = 10) -> bool:
-        """Test if proxy is working"""
+    def test_proxy(self, proxy_dict: Dict[str, str], timeout: int = 10) -> Optional[float]:
+        """Test if proxy is working, returning its latency in seconds (None if not)"""
         try:
-            response = requests.get(
+            start_time = time.monotonic()
+            response = _SESSION.get(
                 'http://httpbin.org/ip',
                 proxies={'http': proxy_dict['http'], 'https': proxy_dict['https']},
                 timeout=timeout,
                 headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
             )
-            return response.status_code == 200
+            if response.status_code == 200:
+                return time.monotonic() - start_time
+            return None
         except:
-            return False
+            return None
     
     def get_working_proxy(self, max_attempts: int = 3) -> Optional[Dict[str, str]]:
         """Get a working proxy after testing, with caching"""
-        current_time = time.time()
-        
-        # Re-test proxies every 5 minutes
-        if current_time - self.last_test_time > 300:
-            self._refresh_working_proxies()
-            self.last_test_time = current_time
+        # Re-test proxies every 5 minutes; with nothing to serve, also wait out
+        # a refresh another caller may have in progress
+        if not self.working_proxies or time.time() - self.last_test_time > 300:
+            self._refresh_if_due()
         
-        # Try working proxies first
-        if self.working_proxies:
-            for _ in range(max_attempts):
-                proxy = random.choice(self.working_proxies)
-                # Quick test
-                if self.test_proxy(proxy, timeout=5):
-                    return proxy
-                else:
-                    # Remove from working list if failed
-                    self.working_proxies.remove(proxy)
-                    self.failed_proxies.append(proxy)
+        # Hand out the fastest working proxy, probing it first unless it was
+        # confirmed recently; failed probes count towards ejecting it
+        for _ in range(max_attempts):
+            proxy = self._next_fastest_proxy()
+            if not proxy:
+                break
+            
+            if time.time() - self.last_success_times.get(proxy['raw'], 0) < PROXY_RECHECK_INTERVAL:
+                return proxy
+            if self.test_proxy(proxy, timeout=PROXY_PROBE_TIMEOUT) is not None:
+                self.report_success(proxy)
+                return proxy
+            self.report_failure(proxy)
         
         # Fallback to testing random proxies
         for _ in range(max_attempts):
             proxy = self.get_random_proxy()
-            if proxy and self.test_proxy(proxy, timeout=8):
+            latency = self.test_proxy(proxy, timeout=8) if proxy else None
+            if latency is not None:
                 if proxy not in self.working_proxies:
                     self.working_proxies.append(proxy)
+                    with self._heap_lock:
+                        heapq.heappush(self._latency_heap, (latency, next(self._heap_counter), proxy))
                 return proxy
         
         logger.warning("No working proxy found")
         return None
     
+    def _refresh_if_due(self):
+        """Run a refresh unless another caller already is or just did"""
+        # Callers that lose the race keep serving the current (stale) proxies
+        # and only wait for the refresh when there is nothing to serve yet
+        if not self._refresh_lock.acquire(blocking=not self.working_proxies):
+            return
+        try:
+            current_time = time.time()
+            if current_time - self.last_test_time > 300:
+                # Marked before probing so late arrivals don't start another refresh
+                self.last_test_time = current_time
+                self._refresh_working_proxies()
+        finally:
+            self._refresh_lock.release()
+    
+    def _next_fastest_proxy(self) -> Optional[Dict[str, str]]:
+        """Pop the fastest working proxy and push it back slightly slower"""
+        with self._heap_lock:
+            while self._latency_heap:
+                latency, _, proxy = self._latency_heap[0]
+                if proxy not in self.working_proxies:
+                    # Removed by report_failure since it was ranked
+                    heapq.heappop(self._latency_heap)
+                    continue
+                
+                heapq.heapreplace(self._latency_heap, (latency * LATENCY_SPREAD, next(self._heap_counter), proxy))
+                return proxy
+        return None
+    
+    def report_success(self, proxy_dict: Dict[str, str]):
+        """Record a successful request through a proxy"""
+        self.failure_counts.pop(proxy_dict['raw'], None)
+        self.last_success_times[proxy_dict['raw']] = time.time()
+    
+    def report_failure(self, proxy_dict: Dict[str, str]):
+        """Record a failed request, taking the proxy out of rotation after repeated failures"""
+        failures = self.failure_counts.get(proxy_dict['raw'], 0) + 1
+        self.failure_counts[proxy_dict['raw']] = failures
+        
+        if failures >= PROXY_FAILURE_THRESHOLD and proxy_dict in self.working_proxies:
+            # Stays out until the next refresh re-tests it
+            self.working_proxies.remove(proxy_dict)
+            self.failed_proxies.append(proxy_dict)
+            logger.info(f"Proxy {proxy_dict['raw']} removed after {failures} consecutive failures")
+    
     def _refresh_working_proxies(self):
         """Refresh the working proxies list"""
         logger.debug("Refreshing proxy list...")
-        self.working_proxies = []
-        self.failed_proxies = []
+        working = []
+        failed = []
         
-        # Test up to 5 proxies to avoid delays
-        test_proxies = random.sample(self.proxies, min(5, len(self.proxies)))
+        # Probe every proxy concurrently, so a refresh takes about one timeout
+        if self.proxies:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(REFRESH_WORKERS, len(self.proxies))) as executor:
+                futures = {executor.submit(self.test_proxy, proxy, 5): proxy for proxy in self.proxies}
+                for future in concurrent.futures.as_completed(futures):
+                    latency = future.result()
+                    if latency is not None:
+                        working.append((latency, next(self._heap_counter), futures[future]))
+                    else:
+                        failed.append(futures[future])
         
-        for proxy in test_proxies:
-            if self.test_proxy(proxy, timeout=5):
-                self.working_proxies.append(proxy)
-            else:
-                self.failed_proxies.append(proxy)
+        # A sorted list is already a valid heap
+        working.sort()
+        with self._heap_lock:
+            self._latency_heap = working
+        self.working_proxies = [proxy for _, _, proxy in working]
+        self.failed_proxies = failed
+        self.failure_counts = {}
+        # Proxies that just passed a probe need no recheck for a while
+        refreshed_at = time.time()
+        self.last_success_times = {proxy['raw']: refreshed_at for proxy in self.working_proxies}
         
         logger.info(f"Proxy refresh: {len(self.working_proxies)} working, {len(self.failed_proxies)} failed")
+        self._save_cached_proxies(working)
+    
+    @staticmethod
+    def _cache_key(proxy_dict: Dict[str, str]) -> str:
+        """Identify a proxy by ip:port so credentials are never written to disk"""
+        return ':'.join(proxy_dict['raw'].split(':')[:2])
+    
+    def _load_cached_proxies(self):
+        """Restore the working proxies saved by a recent refresh"""
+        by_key = {self._cache_key(proxy): proxy for proxy in self.proxies}
+        working = []
+        for key, latency, _ in _read_proxy_cache():
+            proxy = by_key.get(key)
+            if proxy:
+                working.append((latency, next(self._heap_counter), proxy))
+        
+        if working:
+            working.sort()
+            self._latency_heap = working
+            self.working_proxies = [proxy for _, _, proxy in working]
+            # Counts as a fresh test, so the next refresh is the usual 5 minutes away
+            self.last_test_time = time.time()
+            logger.debug(f"Loaded {len(working)} working proxies from {PROXY_CACHE_PATH}")
+    
+    def _save_cached_proxies(self, working: list):
+        """Merge the latency-ranked working proxies into the cache for other managers to reuse"""
+        # A manager without proxies (the default when none are configured) has nothing to add
+        if not self.proxies:
+            return
+        
+        probed = {self._cache_key(proxy) for proxy in self.proxies}
+        tested_at = time.time()
+        tmp_path = f"{PROXY_CACHE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with _PROXY_CACHE_SAVE_LOCK:
+            # Keep entries for proxies this manager doesn't know; replace the ones it probed
+            entries = [
+                {'proxy': key, 'latency': latency, 'tested_at': entry_tested_at}
+                for key, latency, entry_tested_at in _read_proxy_cache()
+                if key not in probed
+            ]
+            entries.extend(
+                {'proxy': self._cache_key(proxy), 'latency': latency, 'tested_at': tested_at}
+                for latency, _, proxy in working
+            )
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(entries, f)
+                # Atomic swap, so concurrent readers never see a partial file
+                os.replace(tmp_path, PROXY_CACHE_PATH)
+            except OSError as e:
+                logger.warning(f"Failed to save proxy cache: {e}")
     
     def get_proxy_stats(self) -> Dict:
         """Get proxy statistics"""
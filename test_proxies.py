@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import os
 from dotenv import load_dotenv
@@ -8,6 +9,14 @@ from typing import List, Dict
 
 load_dotenv()
 
+# One pooled session for all probes so each worker thread keeps its proxy
+# connection alive between requests
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+# Probes are almost all network wait, so many can be in flight at once
+MAX_PROBE_WORKERS = 50
+
 def test_single_proxy(proxy_string: str) -> Dict:
     """Test a single proxy and return results"""
     try:
@@ -24,7 +33,7 @@ def test_single_proxy(proxy_string: str) -> Dict:
         
         # Test the proxy
         start_time = time.time()
-        response = requests.get(
+        response = SESSION.get(
             'http://httpbin.org/ip',
             proxies=proxy_dict,
             timeout=10,
@@ -66,7 +75,7 @@ def test_all_proxies():
     working_proxies = []
     failed_proxies = []
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(MAX_PROBE_WORKERS, len(proxies)))) as executor:
         future_to_proxy = {executor.submit(test_single_proxy, proxy): proxy for proxy in proxies}
         
         for future in concurrent.futures.as_completed(future_to_proxy):
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+
+import proxy_manager
+from proxy_manager import ProxyManager, PROXY_FAILURE_THRESHOLD
+
+class ProxyEjectionTest(unittest.TestCase):
+    def setUp(self):
+        # Keep refreshes from touching the real proxy cache
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.original_cache_path = proxy_manager.PROXY_CACHE_PATH
+        proxy_manager.PROXY_CACHE_PATH = os.path.join(self.tmpdir.name, 'proxy_cache.json')
+        
+        self.dead = set()
+        self.manager = ProxyManager(['10.0.0.1:8000', '10.0.0.2:8000'])
+        self.manager.test_proxy = lambda proxy, timeout=10: None if proxy['raw'] in self.dead else 0.1
+        self.manager._refresh_working_proxies()
+        self.manager.last_test_time = time.time()
+    
+    def tearDown(self):
+        proxy_manager.PROXY_CACHE_PATH = self.original_cache_path
+        self.tmpdir.cleanup()
+    
+    def test_report_failure_ejects_after_threshold(self):
+        proxy = self.manager.working_proxies[0]
+        for _ in range(PROXY_FAILURE_THRESHOLD - 1):
+            self.manager.report_failure(proxy)
+        self.assertIn(proxy, self.manager.working_proxies)
+        
+        self.manager.report_failure(proxy)
+        self.assertNotIn(proxy, self.manager.working_proxies)
+        self.assertIn(proxy, self.manager.failed_proxies)
+    
+    def test_report_success_resets_failures(self):
+        proxy = self.manager.working_proxies[0]
+        for _ in range(PROXY_FAILURE_THRESHOLD - 1):
+            self.manager.report_failure(proxy)
+        self.manager.report_success(proxy)
+        
+        for _ in range(PROXY_FAILURE_THRESHOLD - 1):
+            self.manager.report_failure(proxy)
+        self.assertIn(proxy, self.manager.working_proxies)
+    
+    def test_failed_probes_eject_dead_proxy(self):
+        # Force a recheck on every hand-out
+        self.manager.last_success_times = {}
+        self.dead.add('10.0.0.1:8000')
+        
+        for _ in range(PROXY_FAILURE_THRESHOLD + 1):
+            self.assertEqual(self.manager.get_working_proxy()['raw'], '10.0.0.2:8000')
+            self.manager.last_success_times = {}
+        
+        self.assertEqual([proxy['raw'] for proxy in self.manager.working_proxies], ['10.0.0.2:8000'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import sys
+import concurrent.futures
 from dotenv import load_dotenv
 from api_manager import APIManager
 from jobberman_scraper import JobbermanScraper
@@ -9,8 +10,8 @@ from user_agent_manager import UserAgentManager
 
 load_dotenv()
 
-def test_apis():
-    """Test all API sources individually"""
+def run_api_checks(executor: concurrent.futures.Executor):
+    """Test all API sources individually, running the queries on executor"""
     print("🧪 Testing Individual Job Sources")
     print("=" * 40)
     
@@ -29,48 +30,48 @@ def test_apis():
         ('Marketing', 'Remote')
     ]
     
+    searches = (
+        ('JSearch', api_manager.search_jsearch),
+        ('Jooble', api_manager.search_jooble),
+        ('Adzuna', api_manager.search_adzuna)
+    )
+    
+    # Start every query up front so the network waits overlap; results
+    # are still printed in order below
+    futures = {
+        (keywords, location, name): executor.submit(search, keywords, location, 3)
+        for keywords, location in test_cases
+        for name, search in searches
+    }
+    
     for keywords, location in test_cases:
         print(f"\n🔍 Testing: '{keywords}' in '{location}'")
         print("-" * 30)
         
-        # Test JSearch
-        try:
-            jsearch_jobs = api_manager.search_jsearch(keywords, location, 3)
-            print(f"✅ JSearch: {len(jsearch_jobs)} jobs")
-            if jsearch_jobs:
-                print(f"   Sample: {jsearch_jobs[0]['title']} at {jsearch_jobs[0]['company']}")
-        except Exception as e:
-            print(f"❌ JSearch failed: {str(e)}")
-        
-        # Test Jooble
-        try:
-            jooble_jobs = api_manager.search_jooble(keywords, location, 3)
-            print(f"✅ Jooble: {len(jooble_jobs)} jobs")
-            if jooble_jobs:
-                print(f"   Sample: {jooble_jobs[0]['title']} at {jooble_jobs[0]['company']}")
-        except Exception as e:
-            print(f"❌ Jooble failed: {str(e)}")
-        
-        # Test Adzuna
-        try:
-            adzuna_jobs = api_manager.search_adzuna(keywords, location, 3)
-            print(f"✅ Adzuna: {len(adzuna_jobs)} jobs")
-            if adzuna_jobs:
-                print(f"   Sample: {adzuna_jobs[0]['title']} at {adzuna_jobs[0]['company']}")
-        except Exception as e:
-            print(f"❌ Adzuna failed: {str(e)}")
+        for name, _ in searches:
+            try:
+                jobs = futures[(keywords, location, name)].result()
+                print(f"✅ {name}: {len(jobs)} jobs")
+                if jobs:
+                    print(f"   Sample: {jobs[0]['title']} at {jobs[0]['company']}")
+            except Exception as e:
+                print(f"❌ {name} failed: {str(e)}")
 
-def test_jobberman():
-    """Test Jobberman scraper"""
+def search_jobberman():
+    """Run the Jobberman test search"""
+    proxy_manager = ProxyManager()
+    ua_manager = UserAgentManager()
+    jobberman = JobbermanScraper(proxy_manager, ua_manager)
+    
+    return jobberman.search_jobs("Developer", "Lagos", max_results=3)
+
+def run_jobberman_check(jobberman_future: concurrent.futures.Future):
+    """Report the Jobberman search running in jobberman_future"""
     print(f"\n🧪 Testing Jobberman Scraper")
     print("-" * 30)
     
     try:
-        proxy_manager = ProxyManager()
-        ua_manager = UserAgentManager()
-        jobberman = JobbermanScraper(proxy_manager, ua_manager)
-        
-        jobs = jobberman.search_jobs("Developer", "Lagos", max_results=3)
+        jobs = jobberman_future.result()
         print(f"✅ Jobberman: {len(jobs)} jobs")
         if jobs:
             for i, job in enumerate(jobs[:2]):
@@ -78,7 +79,20 @@ def test_jobberman():
     except Exception as e:
         print(f"❌ Jobberman failed: {str(e)}")
 
+def test_apis():
+    """Test all API sources individually"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=9) as executor:
+        run_api_checks(executor)
+
+def test_jobberman():
+    """Test Jobberman scraper"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        run_jobberman_check(executor.submit(search_jobberman))
+
 if __name__ == "__main__":
-    test_apis()
-    test_jobberman()
+    # Jobberman and the APIs are different hosts, so all of them run at once
+    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        jobberman_future = executor.submit(search_jobberman)
+        run_api_checks(executor)
+        run_jobberman_check(jobberman_future)
     print(f"\n✅ Individual testing complete!")
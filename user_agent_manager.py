@@ -1,69 +1,106 @@
 import random
+import threading
 from fake_useragent import UserAgent
+from urllib3.util.request import ACCEPT_ENCODING
 import logging
+from types import MappingProxyType
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Fallback user agents
+FALLBACK_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0'
+)
+CHROME_FALLBACK_AGENTS = tuple(ua for ua in FALLBACK_AGENTS if 'Chrome' in ua)
+FIREFOX_FALLBACK_AGENTS = tuple(ua for ua in FALLBACK_AGENTS if 'Firefox' in ua)
+
+# Headers sent alongside the User-Agent; built once and copied per call
+BASE_HEADERS = MappingProxyType({
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    # Advertises br (and zstd) only when a decoder is installed
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+})
+
+# Agents drawn from fake_useragent per browser family before reusing them;
+# each draw costs milliseconds, a pick from a full pool does not
+UA_POOL_SIZE = 50
+
+# Loading the fake_useragent data takes tens of milliseconds, so it is done
+# once and shared by every manager (the aggregator builds one per request)
+_UA: Optional[UserAgent] = None
+_UA_LOADED = False
+_UA_LOCK = threading.Lock()
+_UA_POOLS: Dict[str, List[str]] = {'random': [], 'chrome': [], 'firefox': []}
+
+def _get_shared_user_agent() -> Optional[UserAgent]:
+    """Get the shared UserAgent, loading it on first use (None if it failed)"""
+    global _UA, _UA_LOADED
+    with _UA_LOCK:
+        if not _UA_LOADED:
+            try:
+                _UA = UserAgent()
+            except Exception as e:
+                logger.warning(f"Failed to initialize UserAgent: {e}")
+            _UA_LOADED = True
+        return _UA
+
 class UserAgentManager:
     def __init__(self):
-        try:
-            self.ua = UserAgent()
-        except Exception as e:
-            logger.warning(f"Failed to initialize UserAgent: {e}")
-            self.ua = None
+        self.ua = _get_shared_user_agent()
+        self.fallback_agents = FALLBACK_AGENTS
+    
+    def _pooled_user_agent(self, family: str) -> str:
+        """Draw a user agent of the given family, filling its pool first"""
+        pool = _UA_POOLS[family]
+        if len(pool) >= UA_POOL_SIZE:
+            return random.choice(pool)
         
-        # Fallback user agents
-        self.fallback_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0'
-        ]
+        user_agent = getattr(self.ua, family)
+        pool.append(user_agent)
+        return user_agent
     
     def get_random_user_agent(self) -> str:
         """Get a random user agent"""
         try:
             if self.ua:
-                return self.ua.random
+                return self._pooled_user_agent('random')
         except Exception as e:
             logger.warning(f"Error getting user agent from fake_useragent: {e}")
         
-        return random.choice(self.fallback_agents)
+        return random.choice(FALLBACK_AGENTS)
     
     def get_chrome_user_agent(self) -> str:
         """Get a Chrome user agent"""
         try:
             if self.ua:
-                return self.ua.chrome
+                return self._pooled_user_agent('chrome')
         except Exception as e:
             logger.warning(f"Error getting Chrome user agent: {e}")
         
-        chrome_agents = [ua for ua in self.fallback_agents if 'Chrome' in ua]
-        return random.choice(chrome_agents) if chrome_agents else self.fallback_agents[0]
+        return random.choice(CHROME_FALLBACK_AGENTS)
     
     def get_firefox_user_agent(self) -> str:
         """Get a Firefox user agent"""
         try:
             if self.ua:
-                return self.ua.firefox
+                return self._pooled_user_agent('firefox')
         except Exception as e:
             logger.warning(f"Error getting Firefox user agent: {e}")
         
-        firefox_agents = [ua for ua in self.fallback_agents if 'Firefox' in ua]
-        return random.choice(firefox_agents) if firefox_agents else self.fallback_agents[-1]
+        return random.choice(FIREFOX_FALLBACK_AGENTS)
     
     def get_headers(self, referer: str = None) -> dict:
         """Get complete headers with random user agent"""
-        headers = {
-            'User-Agent': self.get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
+        headers = {'User-Agent': self.get_random_user_agent(), **BASE_HEADERS}
         
         if referer:
             headers['Referer'] = referer